@@ -0,0 +1,124 @@
+"""
+Mesure de débit de la prévisualisation et de l'OCR sans webcam ni fenêtre
+Rejoue une source de frames (synthétique, vidéo, dossier d'images) à cadence
+fixe ou aussi vite que possible, de façon déterministe (utilisable en CI).
+
+Usage:
+    python bench_pipeline.py --source synthetic --frames 2000
+    python bench_pipeline.py --source images:captures --ocr-every 1 --frames 20
+    python bench_pipeline.py --source video:session.mp4 --fps 30
+"""
+
+import argparse
+import json
+import time
+
+import ocr_engine
+from frame_buffers import FrameProcessor
+from frame_sources import Pacer, create_source
+from metrics import percentile
+
+
+def run_pipeline(source, frames, ocr_every=0, fps=None):
+    """Lit `frames` frames et renvoie les durées par frame et par OCR (s)
+
+    Seuls les passages OCR ayant produit du texte sont comptés; le nombre
+    de passages sans texte (ou en erreur) est renvoyé à part, comme celui
+    des frames illisibles (perdues, la lecture continue).
+    """
+    processor = FrameProcessor(size=(640, 480))
+    pacer = Pacer(fps)
+    frame_times = []
+    ocr_times = []
+    ocr_empty = 0
+    dropped = 0
+
+    for i in range(frames):
+        pacer.wait()
+        start = time.perf_counter()
+        if processor.read(source) is None:
+            dropped += 1
+            continue
+        frame_times.append(time.perf_counter() - start)
+
+        if ocr_every and i % ocr_every == 0:
+            frame = processor.snapshot()
+            if frame is None:
+                continue
+            start = time.perf_counter()
+            try:
+                text = ocr_engine.extract_text(frame)
+            finally:
+                processor.release(frame)
+            if ocr_engine.is_text_result(text):
+                ocr_times.append(time.perf_counter() - start)
+            else:
+                ocr_empty += 1
+
+    return frame_times, ocr_times, ocr_empty, dropped
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Débit prévisualisation et OCR")
+    parser.add_argument('--source', default='synthetic', help="camera:0, video:f.mp4, images:captures, synthetic")
+    parser.add_argument('--frames', type=int, default=1000, help="Nombre de frames")
+    parser.add_argument('--fps', type=float, default=0, help="Cadence imposée (0 = aussi vite que possible)")
+    parser.add_argument('--ocr-every', type=int, default=0, help="OCR tous les N frames (0 = jamais)")
+    parser.add_argument('--json', action='store_true', help="Sortie JSON")
+    args = parser.parse_args(argv)
+
+    # Sans Tesseract, les mesures OCR n'auraient aucun sens
+    if args.ocr_every and not ocr_engine.TESSERACT_AVAILABLE:
+        raise SystemExit("OCR demandé (--ocr-every) mais Tesseract n'est pas disponible")
+
+    source = create_source(args.source, fps=args.fps)
+    if not source.isOpened():
+        raise SystemExit(f"Impossible d'ouvrir la source {args.source}")
+
+    start = time.perf_counter()
+    try:
+        frame_times, ocr_times, ocr_empty, dropped = run_pipeline(source, args.frames, args.ocr_every, args.fps)
+    finally:
+        source.release()
+    duration = time.perf_counter() - start
+
+    report = {
+        'source': args.source,
+        'frames': len(frame_times),
+        'dropped': dropped,
+        'duration_s': round(duration, 3),
+        'frames_per_s': round(len(frame_times) / duration, 1) if duration else 0.0,
+        'frame_ms': {
+            'p50': round(percentile(frame_times, 50) * 1000, 2),
+            'p95': round(percentile(frame_times, 95) * 1000, 2),
+        },
+        'ocr_runs': len(ocr_times),
+        'ocr_empty': ocr_empty,
+        'ocr_per_s': round(len(ocr_times) / sum(ocr_times), 2) if ocr_times else 0.0,
+        'ocr_ms': {
+            'p50': round(percentile(ocr_times, 50) * 1000, 1),
+            'p95': round(percentile(ocr_times, 95) * 1000, 1),
+        },
+    }
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print(f"Source: {args.source} - {report['frames']} frames en {report['duration_s']} s")
+        print(f"Prévisualisation: {report['frames_per_s']} frames/s "
+              f"(p50 {report['frame_ms']['p50']} ms, p95 {report['frame_ms']['p95']} ms)")
+        if dropped:
+            print(f"Frames perdues (illisibles): {dropped}")
+        if ocr_times:
+            print(f"OCR: {report['ocr_runs']} passes, {report['ocr_per_s']} images/s "
+                  f"(p50 {report['ocr_ms']['p50']} ms, p95 {report['ocr_ms']['p95']} ms)")
+        if ocr_empty:
+            print(f"OCR: {ocr_empty} passes sans texte ou en erreur (non comptées)")
+
+    # Échec si l'OCR a été demandé sans produire aucun résultat exploitable
+    if args.ocr_every and not ocr_times:
+        raise SystemExit("Aucun passage OCR n'a produit de texte")
+
+
+if __name__ == "__main__":
+    main()
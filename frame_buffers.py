@@ -0,0 +1,129 @@
+"""
+Gestion mémoire bornée des frames caméra
+- Buffers numpy de taille fixe réutilisés d'un frame à l'autre
+- Pool de buffers de capture avec budget mémoire explicite
+Indépendant de Kivy: la texture est gérée par le widget de prévisualisation.
+"""
+
+import threading
+
+import cv2
+import numpy as np
+
+# Budget mémoire des buffers de capture (copies du frame envoyées à l'OCR)
+CAPTURE_MEMORY_BUDGET = 16 * 1024 * 1024  # 16 Mo
+
+
+class FramePool:
+    """Pool de tableaux numpy de taille fixe, réutilisés entre captures"""
+
+    def __init__(self, shape, count=2, dtype=np.uint8, budget=CAPTURE_MEMORY_BUDGET):
+        frame_bytes = int(np.prod(shape)) * np.dtype(dtype).itemsize
+        # Le budget limite le nombre de buffers alloués
+        count = min(count, budget // frame_bytes)
+        if count < 1:
+            raise MemoryError(
+                f"Frame {shape} ({frame_bytes} octets) dépasse le budget de {budget} octets"
+            )
+
+        self.shape = tuple(shape)
+        self.dtype = np.dtype(dtype)
+        self.nbytes = frame_bytes * count
+        self._buffers = [np.empty(shape, dtype=dtype) for _ in range(count)]
+        self._free = list(self._buffers)
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Renvoie un buffer libre, ou None si tous sont utilisés"""
+        with self._lock:
+            return self._free.pop() if self._free else None
+
+    def release(self, buffer):
+        """Rend un buffer au pool (les buffers étrangers sont ignorés)"""
+        with self._lock:
+            owned = any(b is buffer for b in self._buffers)
+            if owned and not any(b is buffer for b in self._free):
+                self._free.append(buffer)
+
+
+class FrameProcessor:
+    """Lecture caméra → redimensionnement → RGB dans des buffers réutilisés"""
+
+    def __init__(self, size=(640, 480), capture_count=2, budget=CAPTURE_MEMORY_BUDGET):
+        width, height = size
+        self.size = size
+        self.capture_count = capture_count
+        self.budget = budget
+
+        # Buffers d'affichage alloués une seule fois
+        self.resized = np.empty((height, width, 3), dtype=np.uint8)
+        self.rgb = np.empty((height, width, 3), dtype=np.uint8)
+        # Buffer de lecture: taille caméra connue au premier frame
+        self.raw = None
+        self.has_frame = False
+
+        self.capture_pool = None
+        self.lock = threading.Lock()
+
+    def read(self, camera):
+        """Lit un frame et renvoie le buffer RGB (réutilisé), ou None"""
+        with self.lock:
+            ret, frame = camera.read(self.raw)
+            if not ret or frame is None:
+                return None
+            self.raw = frame
+
+            width, height = self.size
+            if frame.shape[:2] != (height, width):
+                cv2.resize(frame, self.size, dst=self.resized)
+                frame = self.resized
+
+            cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=self.rgb)
+            self.has_frame = True
+            return self.rgb
+
+    def snapshot(self):
+        """Copie le dernier frame BGR (pleine résolution) dans un buffer du pool
+
+        Le buffer doit être rendu avec release() après usage. Un frame plus
+        grand que le budget (4K, photos de téléphone) est copié hors pool:
+        la copie est libérée après usage au lieu d'être conservée.
+        """
+        with self.lock:
+            if not self.has_frame:
+                return None
+
+            if self.capture_pool is None or self.capture_pool.shape != self.raw.shape:
+                self.capture_pool = None
+                try:
+                    self.capture_pool = FramePool(
+                        self.raw.shape, count=self.capture_count, budget=self.budget
+                    )
+                except MemoryError:
+                    return self.raw.copy()
+            buffer = self.capture_pool.acquire()
+            if buffer is None:
+                return None
+            np.copyto(buffer, self.raw)
+            return buffer
+
+    def release(self, buffer):
+        """Rend un buffer de capture au pool"""
+        with self.lock:
+            if self.capture_pool is not None:
+                self.capture_pool.release(buffer)
+
+    def reset(self):
+        """Oublie le dernier frame (caméra arrêtée)"""
+        with self.lock:
+            self.has_frame = False
+
+    @property
+    def nbytes(self):
+        """Mémoire totale occupée par les buffers"""
+        total = self.resized.nbytes + self.rgb.nbytes
+        if self.raw is not None:
+            total += self.raw.nbytes
+        if self.capture_pool is not None:
+            total += self.capture_pool.nbytes
+        return total
@@ -0,0 +1,209 @@
+"""
+Sources de frames interchangeables
+- CameraSource: caméra en direct (cv2.VideoCapture)
+- VideoFileSource: relecture d'un fichier vidéo enregistré
+- ImageDirectorySource: relecture d'un dossier d'images (ex: captures/)
+- SyntheticSource: générateur déterministe (tests et mesures sans webcam)
+
+Toutes exposent l'API de cv2.VideoCapture utilisée par l'application:
+isOpened(), read(image=None) -> (ret, frame), release().
+La cadence est donnée par l'attribut `fps` (None = aussi vite que possible)
+et appliquée par l'appelant (Clock Kivy ou Pacer en mode sans fenêtre).
+
+Spécification texte (variable d'environnement READIT_SOURCE):
+    camera:0, video:session.mp4, images:captures, synthetic, synthetic:1280x720
+"""
+
+import abc
+import os
+import time
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+DEFAULT_SOURCE = "camera:0"
+# Cadence par défaut des sources de relecture (celle de la caméra)
+DEFAULT_FPS = 30
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.bmp')
+
+
+class FrameSource(abc.ABC):
+    """Interface commune des sources de frames"""
+
+    fps = None
+
+    @abc.abstractmethod
+    def isOpened(self):
+        """Vrai si la source peut fournir des frames"""
+
+    @abc.abstractmethod
+    def read(self, image=None):
+        """Renvoie (ret, frame); `image` est un buffer réutilisable optionnel"""
+
+    def release(self):
+        pass
+
+
+class CameraSource(FrameSource):
+    """Caméra en direct"""
+
+    def __init__(self, index=0, width=640, height=480, fps=30):
+        self.fps = fps
+        self.capture = cv2.VideoCapture(index)
+        if self.capture.isOpened():
+            self.capture.set(cv2.CAP_PROP_FRAME_WIDTH, width)
+            self.capture.set(cv2.CAP_PROP_FRAME_HEIGHT, height)
+            if fps:
+                self.capture.set(cv2.CAP_PROP_FPS, fps)
+
+    def isOpened(self):
+        return self.capture.isOpened()
+
+    def read(self, image=None):
+        return self.capture.read(image)
+
+    def release(self):
+        self.capture.release()
+
+
+class VideoFileSource(FrameSource):
+    """Relecture d'un fichier vidéo, en boucle si demandé"""
+
+    def __init__(self, path, fps=None, loop=False):
+        self.path = str(path)
+        self.loop = loop
+        self.capture = cv2.VideoCapture(self.path)
+        # Cadence du fichier par défaut, 0 = aussi vite que possible
+        if fps is None:
+            file_fps = self.capture.get(cv2.CAP_PROP_FPS) if self.capture.isOpened() else 0
+            fps = file_fps or DEFAULT_FPS
+        self.fps = fps or None
+
+    def isOpened(self):
+        return self.capture.isOpened()
+
+    def read(self, image=None):
+        ret, frame = self.capture.read(image)
+        if not ret and self.loop:
+            self.capture.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            ret, frame = self.capture.read(image)
+        return ret, frame
+
+    def release(self):
+        self.capture.release()
+
+
+class ImageDirectorySource(FrameSource):
+    """Relecture des images d'un dossier, par ordre de nom"""
+
+    def __init__(self, directory="captures", fps=None, loop=True):
+        self.fps = fps or None
+        self.loop = loop
+        directory = Path(directory)
+        self.paths = sorted(
+            p for p in directory.iterdir() if p.suffix.lower() in IMAGE_EXTENSIONS
+        ) if directory.is_dir() else []
+        self.index = 0
+
+    def isOpened(self):
+        return bool(self.paths)
+
+    def read(self, image=None):
+        if self.index >= len(self.paths):
+            if not self.loop or not self.paths:
+                return False, None
+            self.index = 0
+
+        # Décodage à chaque lecture: aucune image gardée en mémoire
+        frame = cv2.imread(str(self.paths[self.index]))
+        self.index += 1
+        if frame is None:
+            return False, None
+        if image is not None and image.shape == frame.shape:
+            np.copyto(image, frame)
+            return True, image
+        return True, frame
+
+
+class SyntheticSource(FrameSource):
+    """Page de texte générée, défilant d'une ligne de pixels par frame"""
+
+    def __init__(self, width=640, height=480, fps=None, frames=None, seed=0):
+        self.width = width
+        self.height = height
+        self.fps = fps or None
+        self.frames = frames
+        self.count = 0
+        self.page = self._render_page(seed)
+
+    def _render_page(self, seed):
+        rng = np.random.default_rng(seed)
+        page_height = self.height * 2
+        page = np.full((page_height, self.width, 3), 255, dtype=np.uint8)
+        words = ["lecture", "vocale", "texte", "page", "document", "ligne", "image", "camera"]
+        y = 40
+        line = 1
+        while y < page_height:
+            text = f"{line}. " + " ".join(rng.choice(words, size=4))
+            cv2.putText(page, text, (20, y), cv2.FONT_HERSHEY_SIMPLEX, 0.9, (0, 0, 0), 2)
+            y += 40
+            line += 1
+        return page
+
+    def isOpened(self):
+        return True
+
+    def read(self, image=None):
+        if self.frames is not None and self.count >= self.frames:
+            return False, None
+        if image is None or image.shape != (self.height, self.width, 3):
+            image = np.empty((self.height, self.width, 3), dtype=np.uint8)
+
+        offset = self.count % self.height
+        image[:] = self.page[offset:offset + self.height]
+        self.count += 1
+        return True, image
+
+
+class Pacer:
+    """Cadence une boucle sans fenêtre à `fps` images/s (None = sans attente)"""
+
+    def __init__(self, fps=None):
+        self.interval = 1.0 / fps if fps else 0.0
+        self.deadline = time.perf_counter()
+
+    def wait(self):
+        if not self.interval:
+            return
+        self.deadline += self.interval
+        delay = self.deadline - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+        else:
+            # En retard: on repart de maintenant plutôt que de rattraper
+            self.deadline = time.perf_counter()
+
+
+def create_source(spec=None, fps=None):
+    """Crée une source depuis une spécification texte (ex: 'video:session.mp4')
+
+    fps=None: cadence par défaut (caméra, fichier vidéo, sinon DEFAULT_FPS);
+    fps=0: aussi vite que possible (mesures de débit).
+    """
+    spec = spec or os.environ.get('READIT_SOURCE', DEFAULT_SOURCE)
+    if fps is None and os.environ.get('READIT_SOURCE_FPS'):
+        fps = float(os.environ['READIT_SOURCE_FPS'])
+
+    kind, _, arg = spec.partition(':')
+    if kind == 'camera':
+        return CameraSource(int(arg or 0), fps=DEFAULT_FPS if fps is None else fps)
+    if kind == 'video':
+        return VideoFileSource(arg, fps=fps, loop=True)
+    if kind == 'images':
+        return ImageDirectorySource(arg or "captures", fps=DEFAULT_FPS if fps is None else fps)
+    if kind == 'synthetic':
+        width, height = (int(v) for v in arg.split('x')) if arg else (640, 480)
+        return SyntheticSource(width, height, fps=DEFAULT_FPS if fps is None else fps)
+
+    raise ValueError(f"Source de frames inconnue: {spec}")
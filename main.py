@@ -30,12 +30,14 @@ from kivy.core.window import Window
 from kivy.metrics import dp
 from kivy.graphics.texture import Texture
 
+import ocr_engine
+from frame_buffers import FrameProcessor
+from frame_sources import CameraSource, create_source
+from text_merge import TextMerger
+from profiling import profiler
+
 # Imports conditionnels selon la plateforme
-try:
-    import pytesseract
-    TESSERACT_AVAILABLE = True
-except ImportError:
-    TESSERACT_AVAILABLE = False
+if not ocr_engine.TESSERACT_AVAILABLE:
     Logger.warning("OCR: pytesseract non disponible")
 
 try:
@@ -69,6 +71,11 @@ class CameraPreview(BoxLayout):
         self.camera = None
         self.camera_active = False
         self.capture_event = None
+        self.capture_interval = 0
+        
+        # Buffers et texture réutilisés d'un frame à l'autre
+        self.frames = FrameProcessor(size=(640, 480))
+        self.texture = None
         
         # Interface de prévisualisation
         self.build_preview_ui()
@@ -142,23 +149,27 @@ class CameraPreview(BoxLayout):
             return
             
         try:
-            self.camera = cv2.VideoCapture(0)
+            # Caméra par défaut, ou source définie par READIT_SOURCE
+            self.camera = create_source()
             if not self.camera.isOpened():
+                self.camera.release()
+                self.camera = None
                 self.info_label.text = "Erreur: Impossible d'ouvrir la caméra"
                 return
             
-            # Configuration de la caméra
-            self.camera.set(cv2.CAP_PROP_FRAME_WIDTH, 640)
-            self.camera.set(cv2.CAP_PROP_FRAME_HEIGHT, 480)
-            self.camera.set(cv2.CAP_PROP_FPS, 30)
+            # Texture unique, retournée une seule fois
+            if self.texture is None:
+                self.texture = Texture.create(size=(640, 480), colorfmt='rgb')
+                self.texture.flip_vertical()
             
             self.camera_active = True
             self.start_btn.disabled = True
             self.stop_btn.disabled = False
             self.info_label.text = "Caméra active - Prévisualisation en cours"
             
-            # Démarrer la capture périodique
-            self.capture_event = Clock.schedule_interval(self.update_camera, 1.0/30.0)
+            # Démarrer la capture périodique (à chaque frame si fps non défini)
+            self.capture_interval = 1.0 / self.camera.fps if self.camera.fps else 0
+            self.capture_event = Clock.schedule_interval(self.update_camera, self.capture_interval)
             
         except Exception as e:
             Logger.error(f"Erreur démarrage caméra: {e}")
@@ -180,6 +191,7 @@ class CameraPreview(BoxLayout):
         if self.camera:
             self.camera.release()
             self.camera = None
+        self.frames.reset()
         
         # Réinitialiser l'interface
         self.start_btn.disabled = False
@@ -189,30 +201,28 @@ class CameraPreview(BoxLayout):
         # Remettre l'image par défaut
         self.camera_display.source = 'data/logo/kivy-icon-32.png'
     
+    @profiler.timed('update_camera')
     def update_camera(self, dt):
         """Met à jour l'affichage de la caméra"""
         if not self.camera_active or not self.camera:
             return False
         
+        # Ticks manqués quand le thread principal est en retard
+        if self.capture_interval and dt > 2 * self.capture_interval:
+            profiler.count('frames_perdues', int(dt / self.capture_interval) - 1)
+        
         try:
-            ret, frame = self.camera.read()
-            if not ret:
+            # Lecture, redimensionnement et conversion RGB sans allocation
+            frame_rgb = self.frames.read(self.camera)
+            if frame_rgb is None:
+                profiler.count('frames_perdues')
                 return True
             
-            # Redimensionner le frame pour l'affichage
-            frame = cv2.resize(frame, (640, 480))
-            
-            # Convertir BGR vers RGB
-            frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            
-            # Convertir en texture Kivy
-            buf = frame_rgb.tobytes()
-            texture = Texture.create(size=(640, 480))
-            texture.blit_buffer(buf, colorfmt='rgb', bufferfmt='ubyte')
-            texture.flip_vertical()
-            
-            # Mettre à jour l'affichage
-            self.camera_display.texture = texture
+            # Mise à jour de la texture existante (vue 1D, sans copie)
+            self.texture.blit_buffer(frame_rgb.reshape(-1), colorfmt='rgb', bufferfmt='ubyte')
+            if self.camera_display.texture is not self.texture:
+                self.camera_display.texture = self.texture
+            self.camera_display.canvas.ask_update()
             
         except Exception as e:
             Logger.error(f"Erreur mise à jour caméra: {e}")
@@ -221,14 +231,20 @@ class CameraPreview(BoxLayout):
         return True
     
     def capture_current_frame(self):
-        """Capture le frame actuel et le sauvegarde"""
+        """Capture le frame actuel et le sauvegarde
+        
+        Renvoie (chemin, frame). Le frame provient du pool de capture et doit
+        être rendu avec release_frame() après l'OCR.
+        """
         if not self.camera_active or not self.camera:
-            return None
+            return None, None
         
+        frame = None
         try:
-            ret, frame = self.camera.read()
-            if not ret:
-                return None
+            # Copie du dernier frame affiché (pas de seconde lecture caméra)
+            frame = self.frames.snapshot()
+            if frame is None:
+                return None, None
             
             # Créer le dossier de capture
             capture_dir = Path("captures")
@@ -240,17 +256,81 @@ class CameraPreview(BoxLayout):
             cv2.imwrite(str(image_path), frame)
             
             Logger.info(f"Image capturée depuis prévisualisation: {image_path}")
-            return str(image_path)
+            return str(image_path), frame
             
         except Exception as e:
             Logger.error(f"Erreur capture frame: {e}")
-            return None
+            self.release_frame(frame)
+            return None, None
+    
+    def release_frame(self, frame):
+        """Rend un frame capturé au pool"""
+        if frame is not None:
+            self.frames.release(frame)
     
     def cleanup(self):
         """Nettoyage lors de la fermeture"""
         self.stop_camera()
 
 
+class ProfilerOverlay(Label):
+    """Overlay développeur: FPS, frames perdues, OCR/TTS en cours, latences"""
+    
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.size_hint = (None, None)
+        self.size = (dp(300), dp(110))
+        self.font_size = dp(12)
+        self.halign = 'left'
+        self.valign = 'top'
+        self.text_size = self.size
+        self.color = (1, 1, 0.3, 1)
+        self.opacity = 0
+        self.frame_event = None
+        Clock.schedule_interval(self.refresh, 0.5)
+    
+    def record_frame(self, dt):
+        """Intervalle entre deux frames Kivy (dt de la Clock, pas une durée de rendu)"""
+        profiler.record('frame_interval', dt)
+    
+    @profiler.timed('overlay')
+    def refresh(self, dt):
+        """Met à jour l'overlay si le profilage est actif"""
+        if not profiler.enabled:
+            if self.frame_event:
+                self.frame_event.cancel()
+                self.frame_event = None
+            self.opacity = 0
+            return
+        
+        if self.frame_event is None:
+            self.frame_event = Clock.schedule_interval(self.record_frame, 0)
+        
+        # Coin supérieur gauche de la fenêtre
+        self.pos = (dp(5), Window.height - self.height - dp(5))
+        self.opacity = 1
+        
+        stats = profiler.stats()
+        timers = stats['timers']
+        
+        def timer_text(name):
+            timer = timers.get(name)
+            if not timer:
+                return "-"
+            return f"{timer['mean_ms']:.1f} ms (p95 {timer['p95_ms']:.1f})"
+        
+        ocr_last = profiler.last('ocr')
+        self.text = "\n".join([
+            f"FPS UI: {Clock.get_fps():.0f} | Aperçu: {profiler.rate('update_camera'):.0f} i/s",
+            f"Frames perdues: {stats['counters'].get('frames_perdues', 0)}",
+            f"En cours: OCR {stats['gauges'].get('ocr_en_cours', 0)}, "
+            f"TTS {stats['gauges'].get('tts_en_cours', 0)}",
+            f"OCR: {ocr_last * 1000:.0f} ms (dernier)" if ocr_last else "OCR: -",
+            f"update_camera: {timer_text('update_camera')}",
+            f"intervalle frames: {timer_text('frame_interval')}",
+        ])
+
+
 class OCRVoiceApp(TabbedPanel):
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
@@ -260,6 +340,9 @@ class OCRVoiceApp(TabbedPanel):
         self.current_text = ""
         self.is_processing = False
         self.tts_engine = None
+        self.capture_source = None
+        # Document fusionné au fil des captures
+        self.merger = TextMerger()
         
         # Initialisation TTS
         self.init_tts()
@@ -274,14 +357,7 @@ class OCRVoiceApp(TabbedPanel):
         """Initialise le moteur de synthèse vocale"""
         try:
             if TTS_DESKTOP_AVAILABLE and not IS_MOBILE:
-                self.tts_engine = pyttsx3.init()
-                # Configuration voix française si disponible
-                voices = self.tts_engine.getProperty('voices')
-                for voice in voices:
-                    if 'french' in voice.name.lower() or 'fr' in voice.id.lower():
-                        self.tts_engine.setProperty('voice', voice.id)
-                        break
-                self.tts_engine.setProperty('rate', 150)  # Vitesse de lecture
+                self.tts_engine = ocr_engine.create_tts_engine()
                 Logger.info("TTS: Moteur pyttsx3 initialisé")
             elif PLYER_AVAILABLE and IS_MOBILE:
                 Logger.info("TTS: Utilisation de plyer.tts pour mobile")
@@ -412,6 +488,15 @@ class OCRVoiceApp(TabbedPanel):
         self.stop_btn.bind(on_press=self.stop_speech)
         btn_layout.add_widget(self.stop_btn)
         
+        # Bouton nouveau document
+        new_doc_btn = Button(
+            text="Nouveau (N)",
+            font_size=dp(16),
+            background_color=(0.8, 0.6, 0.2, 1)
+        )
+        new_doc_btn.bind(on_press=self.new_document)
+        btn_layout.add_widget(new_doc_btn)
+        
         # Bouton aide
         help_btn = Button(
             text="Aide (H)",
@@ -446,10 +531,23 @@ class OCRVoiceApp(TabbedPanel):
             self.repeat_text()
         elif key == 115:  # S
             self.stop_speech()
+        elif key == 110:  # N
+            self.new_document()
         elif key == 104:  # H
             self.show_help()
+        elif key == 293:  # F12
+            self.toggle_profiling()
         return True
     
+    def toggle_profiling(self):
+        """Active/désactive le profilage et l'overlay développeur"""
+        if profiler.enabled:
+            path = profiler.disable()
+            self.update_status(f"Profilage arrêté - résultats dans {path}")
+        else:
+            profiler.enable()
+            self.update_status("Profilage activé (F12 pour arrêter)")
+    
     def capture_and_read(self, *args):
         """Lance la capture normale et la lecture"""
         if self.is_processing:
@@ -483,17 +581,21 @@ class OCRVoiceApp(TabbedPanel):
         try:
             # Capture depuis la prévisualisation
             Clock.schedule_once(lambda dt: self.update_progress(30), 0)
-            image_path = self.camera_preview.capture_current_frame()
+            image_path, frame = self.camera_preview.capture_current_frame()
             
             if not image_path:
+                self.camera_preview.release_frame(frame)
                 Clock.schedule_once(lambda dt: self.on_process_error("Échec de la capture depuis prévisualisation"), 0)
                 return
             
-            # OCR
+            # OCR directement sur le frame en mémoire (pas de relecture du fichier)
             Clock.schedule_once(lambda dt: self.update_status("Analyse du texte..."), 0)
             Clock.schedule_once(lambda dt: self.update_progress(70), 0)
             
-            text = self.extract_text(image_path)
+            try:
+                text = self.extract_text(frame)
+            finally:
+                self.camera_preview.release_frame(frame)
             
             # Finalisation
             Clock.schedule_once(lambda dt: self.update_progress(100), 0)
@@ -508,17 +610,18 @@ class OCRVoiceApp(TabbedPanel):
         try:
             # Étape 1: Capture d'image
             Clock.schedule_once(lambda dt: self.update_progress(20), 0)
-            image_path = self.capture_image()
+            image_path, frame = self.capture_image()
             
             if not image_path:
                 Clock.schedule_once(lambda dt: self.on_process_error("Échec de la capture"), 0)
                 return
             
-            # Étape 2: OCR
+            # Étape 2: OCR sur le frame en mémoire (pas de relecture du fichier);
+            # la capture mobile n'existe que sous forme de fichier
             Clock.schedule_once(lambda dt: self.update_status("Analyse du texte..."), 0)
             Clock.schedule_once(lambda dt: self.update_progress(60), 0)
             
-            text = self.extract_text(image_path)
+            text = self.extract_text(frame if frame is not None else image_path)
             
             # Étape 3: Finalisation
             Clock.schedule_once(lambda dt: self.update_progress(100), 0)
@@ -529,7 +632,11 @@ class OCRVoiceApp(TabbedPanel):
             Clock.schedule_once(lambda dt: self.on_process_error(str(e)), 0)
     
     def capture_image(self):
-        """Capture une image depuis la caméra"""
+        """Capture une image depuis la caméra
+        
+        Renvoie (chemin, frame). Le frame est None pour la capture mobile,
+        (None, None) en cas d'échec.
+        """
         try:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             
@@ -537,16 +644,20 @@ class OCRVoiceApp(TabbedPanel):
                 # Capture mobile avec Plyer
                 image_path = f"/storage/emulated/0/Pictures/ocr_capture_{timestamp}.jpg"
                 camera.take_picture(filename=image_path, on_complete=self._on_camera_complete)
-                return image_path
+                return image_path, None
             else:
-                # Capture desktop avec OpenCV
-                cap = cv2.VideoCapture(0)
+                # Capture desktop (caméra ou source de relecture)
+                cap = self.get_capture_source()
                 if not cap.isOpened():
+                    cap.release()
+                    self.capture_source = None
                     Logger.error("Impossible d'ouvrir la caméra")
-                    return None
+                    return None, None
                 
                 ret, frame = cap.read()
-                cap.release()
+                if isinstance(cap, CameraSource):
+                    cap.release()
+                    self.capture_source = None
                 
                 if ret:
                     # Créer le dossier de capture
@@ -556,67 +667,61 @@ class OCRVoiceApp(TabbedPanel):
                     image_path = capture_dir / f"capture_{timestamp}.jpg"
                     cv2.imwrite(str(image_path), frame)
                     Logger.info(f"Image capturée: {image_path}")
-                    return str(image_path)
+                    return str(image_path), frame
                 else:
                     Logger.error("Échec de la capture d'image")
-                    return None
+                    return None, None
                     
         except Exception as e:
             Logger.error(f"Erreur de capture: {e}")
-            return None
+            return None, None
+    
+    def get_capture_source(self):
+        """Source de capture: la caméra est rouverte à chaque capture,
+        une source de relecture reste ouverte pour avancer d'image en image"""
+        if self.capture_source is None:
+            self.capture_source = create_source()
+        return self.capture_source
     
     def _on_camera_complete(self, filename):
         """Callback pour la capture mobile"""
         Logger.info(f"Capture mobile terminée: {filename}")
     
-    def extract_text(self, image_path):
-        """Extrait le texte de l'image avec OCR"""
-        if not TESSERACT_AVAILABLE:
-            return "OCR non disponible - pytesseract requis"
-        
+    @profiler.timed('ocr')
+    def extract_text(self, image):
+        """Extrait le texte de l'image (chemin ou frame) avec OCR"""
+        profiler.add_gauge('ocr_en_cours', 1)
         try:
-            # Configuration Tesseract pour le français
-            custom_config = r'--oem 3 --psm 6 -l fra+eng'
-            
-            # Préprocessing de l'image pour améliorer l'OCR
-            image = cv2.imread(image_path)
-            gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
-            
-            # Amélioration du contraste
-            gray = cv2.convertScaleAbs(gray, alpha=1.2, beta=30)
-            
-            # Extraction du texte
-            text = pytesseract.image_to_string(gray, config=custom_config)
-            
-            # Nettoyage du texte
-            text = text.strip()
-            if not text:
-                return "Aucun texte détecté dans l'image"
-            
-            Logger.info(f"Texte extrait: {len(text)} caractères")
-            return text
-            
-        except Exception as e:
-            Logger.error(f"Erreur OCR: {e}")
-            return f"Erreur d'extraction: {e}"
+            return ocr_engine.extract_text(image)
+        finally:
+            profiler.add_gauge('ocr_en_cours', -1)
     
+    @profiler.timed('on_text_extracted')
     def on_text_extracted(self, text):
         """Appelé quand le texte est extrait avec succès"""
-        self.current_text = text
-        self.text_display.text = text
+        if ocr_engine.is_text_result(text):
+            # Seules les lignes nouvelles ou modifiées sont lues
+            new_lines = self.merger.merge(text)
+            self.current_text = self.merger.text
+            self.text_display.text = self.current_text
+            to_speak = "\n".join(new_lines) if new_lines else "Aucun nouveau texte"
+        else:
+            self.text_display.text = text
+            to_speak = text
         self.update_status("Lecture en cours...")
         
         # Activation des boutons
-        self.repeat_btn.disabled = False
+        self.repeat_btn.disabled = not self.current_text
         self.stop_btn.disabled = False
         
         # Lecture automatique
-        self.speak_text(text)
+        self.speak_text(to_speak)
         
         # Masquer la progression
         self.show_progress(False)
         self.is_processing = False
     
+    @profiler.timed('on_process_error')
     def on_process_error(self, error_msg):
         """Appelé en cas d'erreur"""
         self.update_status(f"Erreur: {error_msg}")
@@ -629,11 +734,16 @@ class OCRVoiceApp(TabbedPanel):
         try:
             if TTS_DESKTOP_AVAILABLE and self.tts_engine and not IS_MOBILE:
                 # TTS desktop
+                @profiler.timed('tts')
                 def speak():
-                    self.tts_engine.say(text)
-                    self.tts_engine.runAndWait()
+                    try:
+                        self.tts_engine.say(text)
+                        self.tts_engine.runAndWait()
+                    finally:
+                        profiler.add_gauge('tts_en_cours', -1)
                     Clock.schedule_once(lambda dt: self.on_speech_finished(), 0)
                 
+                profiler.add_gauge('tts_en_cours', 1)
                 threading.Thread(target=speak, daemon=True).start()
                 
             elif PLYER_AVAILABLE and IS_MOBILE:
@@ -649,13 +759,23 @@ class OCRVoiceApp(TabbedPanel):
             Logger.error(f"Erreur TTS: {e}")
             self.update_status(f"Erreur de lecture: {e}")
     
+    @profiler.timed('on_speech_finished')
     def on_speech_finished(self):
         """Appelé quand la lecture est terminée"""
         self.update_status("Lecture terminée")
         self.stop_btn.disabled = True
     
+    def new_document(self, *args):
+        """Oublie le texte déjà lu et commence un nouveau document"""
+        self.merger.reset()
+        self.current_text = ""
+        self.text_display.text = ""
+        self.repeat_btn.disabled = True
+        self.update_status("Nouveau document")
+        self.speak_text("Nouveau document")
+    
     def repeat_text(self, *args):
-        """Relit le dernier texte"""
+        """Relit tout le document"""
         if self.current_text:
             self.stop_btn.disabled = False
             self.update_status("Relecture...")
@@ -677,15 +797,18 @@ class OCRVoiceApp(TabbedPanel):
 Raccourcis clavier:
 • Espace: Capturer et lire
 • P: Capturer de la prévisualisation (desktop)
-• R: Relire le texte
+• R: Relire tout le document
+• N: Nouveau document (oublie le texte déjà lu)
 • S: Arrêter la lecture  
 • H: Afficher cette aide
+• F12: Profilage et overlay développeur
 
 Onglets:
 • OCR Lecteur: Fonctions principales
 • Caméra: Prévisualisation temps réel (desktop)
 
 L'application capture une image, détecte le texte et le lit à voix haute.
+Lors des captures suivantes, seules les nouvelles lignes sont lues.
 Assurez-vous d'avoir un bon éclairage et un texte lisible.
         """
         
@@ -699,15 +822,18 @@ Assurez-vous d'avoir un bon éclairage et un texte lisible.
         # Lecture de l'aide
         self.speak_text("Aide affichée. " + help_text.replace("•", "").replace("\n", " "))
     
+    @profiler.timed('update_status')
     def update_status(self, message):
         """Met à jour le message d'état"""
         self.status_label.text = message
         Logger.info(f"Status: {message}")
     
+    @profiler.timed('update_progress')
     def update_progress(self, value):
         """Met à jour la barre de progression"""
         self.progress.value = value
     
+    @profiler.timed('show_progress')
     def show_progress(self, show):
         """Affiche/masque la barre de progression"""
         self.progress.opacity = 1 if show else 0
@@ -727,6 +853,9 @@ class OCRVoiceApplication(App):
         """Appelé au démarrage de l'application"""
         Logger.info("Application démarrée")
         
+        # Overlay développeur (visible pendant le profilage)
+        Window.add_widget(ProfilerOverlay())
+        
         # Message de bienvenue
         app = self.root
         if IS_MOBILE:
@@ -740,6 +869,12 @@ class OCRVoiceApplication(App):
         # Nettoyage de la caméra
         if hasattr(self.root, 'camera_preview'):
             self.root.camera_preview.cleanup()
+        if self.root.capture_source:
+            self.root.capture_source.release()
+        
+        # Écriture des résultats de profilage
+        if profiler.enabled:
+            profiler.disable()
     
     def on_pause(self):
         """Gestion de la pause (Android)"""
@@ -757,7 +892,7 @@ if __name__ == "__main__":
     else:
         Logger.info("Exécution sur desktop avec prévisualisation caméra")
         # Configuration Windows pour Tesseract si nécessaire
-        if os.name == 'nt':
-            pytesseract.pytesseract.tesseract_cmd = r'C:\Program Files\Tesseract-OCR\tesseract.exe'
+        if os.name == 'nt' and ocr_engine.TESSERACT_AVAILABLE:
+            ocr_engine.pytesseract.pytesseract.tesseract_cmd = r'C:\Program Files\Tesseract-OCR\tesseract.exe'
     
     OCRVoiceApplication().run()
\ No newline at end of file
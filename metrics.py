@@ -0,0 +1,13 @@
+"""
+Outils de mesure partagés par les scripts de test de charge,
+de débit et le profilage
+"""
+
+
+def percentile(values, pct):
+    """Centile `pct` (0 à 100) d'une liste de valeurs, 0.0 si vide"""
+    if not values:
+        return 0.0
+    values = sorted(values)
+    index = min(len(values) - 1, int(round(pct / 100 * (len(values) - 1))))
+    return values[index]
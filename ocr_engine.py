@@ -0,0 +1,150 @@
+"""
+Moteurs OCR et synthèse vocale indépendants de l'interface Kivy
+Utilisé par:
+- main.py (application Kivy)
+- ocr_service.py (service local HTTP / socket Unix)
+"""
+
+import logging
+
+import cv2
+import numpy as np
+
+try:
+    import pytesseract
+    TESSERACT_AVAILABLE = True
+except ImportError:
+    TESSERACT_AVAILABLE = False
+
+try:
+    import pyttsx3
+    TTS_DESKTOP_AVAILABLE = True
+except ImportError:
+    TTS_DESKTOP_AVAILABLE = False
+
+Logger = logging.getLogger("kivy")
+
+# Configuration Tesseract pour le français
+OCR_CONFIG = r'--oem 3 --psm 6 -l fra+eng'
+
+NO_TEXT_MESSAGE = "Aucun texte détecté dans l'image"
+OCR_UNAVAILABLE_MESSAGE = "OCR non disponible - pytesseract requis"
+EXTRACTION_ERROR_PREFIX = "Erreur d'extraction: "
+
+
+def decode_image(data):
+    """Décode des octets d'image (JPEG, PNG...) en tableau BGR"""
+    buf = np.frombuffer(data, dtype=np.uint8)
+    image = cv2.imdecode(buf, cv2.IMREAD_COLOR)
+    if image is None:
+        raise ValueError("Image illisible")
+    return image
+
+
+def preprocess(image):
+    """Préprocessing de l'image pour améliorer l'OCR"""
+    gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+    # Amélioration du contraste
+    return cv2.convertScaleAbs(gray, alpha=1.2, beta=30)
+
+
+def extract_text(image):
+    """Extrait le texte d'une image (chemin ou tableau BGR)"""
+    if not TESSERACT_AVAILABLE:
+        return OCR_UNAVAILABLE_MESSAGE
+
+    try:
+        if isinstance(image, str):
+            image = cv2.imread(image)
+        gray = preprocess(image)
+
+        # Extraction et nettoyage du texte
+        text = pytesseract.image_to_string(gray, config=OCR_CONFIG).strip()
+        if not text:
+            return NO_TEXT_MESSAGE
+
+        Logger.info(f"Texte extrait: {len(text)} caractères")
+        return text
+
+    except Exception as e:
+        Logger.error(f"Erreur OCR: {e}")
+        return f"{EXTRACTION_ERROR_PREFIX}{e}"
+
+
+def is_text_result(text):
+    """Faux si extract_text a renvoyé un message d'erreur ou d'absence de texte"""
+    return not (
+        text in (NO_TEXT_MESSAGE, OCR_UNAVAILABLE_MESSAGE)
+        or text.startswith(EXTRACTION_ERROR_PREFIX)
+    )
+
+
+def extract_data(image):
+    """Extrait texte, boîtes englobantes et confiances (par mot)
+
+    Lève RuntimeError si Tesseract n'est pas disponible.
+    """
+    if not TESSERACT_AVAILABLE:
+        raise RuntimeError(OCR_UNAVAILABLE_MESSAGE)
+
+    gray = preprocess(image)
+    data = pytesseract.image_to_data(
+        gray, config=OCR_CONFIG, output_type=pytesseract.Output.DICT
+    )
+
+    words = []
+    lines = {}
+    for i, word in enumerate(data['text']):
+        word = word.strip()
+        conf = float(data['conf'][i])
+        if not word or conf < 0:
+            continue
+        words.append({
+            'text': word,
+            'confidence': conf,
+            'box': [data['left'][i], data['top'][i], data['width'][i], data['height'][i]],
+        })
+        key = (data['block_num'][i], data['par_num'][i], data['line_num'][i])
+        lines.setdefault(key, []).append(word)
+
+    text = "\n".join(" ".join(line) for _, line in sorted(lines.items()))
+    return {
+        'text': text,
+        'words': words,
+        'mean_confidence': (
+            sum(w['confidence'] for w in words) / len(words) if words else 0.0
+        ),
+    }
+
+
+def warm_up():
+    """Vérifie Tesseract une fois au démarrage (évite le coût au premier appel)"""
+    if not TESSERACT_AVAILABLE:
+        Logger.warning("OCR: pytesseract non disponible")
+        return False
+    try:
+        version = pytesseract.get_tesseract_version()
+        # Premier passage sur une image vide pour charger les modèles de langue
+        pytesseract.image_to_string(
+            np.full((32, 32), 255, dtype=np.uint8), config=OCR_CONFIG
+        )
+        Logger.info(f"OCR: Tesseract {version} prêt")
+        return True
+    except Exception as e:
+        Logger.error(f"OCR: Tesseract indisponible - {e}")
+        return False
+
+
+def create_tts_engine(rate=150):
+    """Initialise pyttsx3 avec une voix française si disponible"""
+    if not TTS_DESKTOP_AVAILABLE:
+        return None
+
+    engine = pyttsx3.init()
+    voices = engine.getProperty('voices')
+    for voice in voices:
+        if 'french' in voice.name.lower() or 'fr' in voice.id.lower():
+            engine.setProperty('voice', voice.id)
+            break
+    engine.setProperty('rate', rate)  # Vitesse de lecture
+    return engine
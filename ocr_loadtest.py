@@ -0,0 +1,124 @@
+"""
+Test de charge du service OCR local (ocr_service.py)
+Mesure le débit (requêtes/s) et la latence (p50, p95, p99, max).
+
+Usage:
+    python ocr_loadtest.py --port 8765 --concurrency 4 --requests 100
+    python ocr_loadtest.py --unix /tmp/readit-ocr.sock --image captures/capture_20250610_094445.jpg
+"""
+
+import argparse
+import http.client
+import json
+import socket
+import threading
+import time
+from pathlib import Path
+
+from metrics import percentile
+
+
+class UnixHTTPConnection(http.client.HTTPConnection):
+    """Connexion HTTP sur socket Unix"""
+
+    def __init__(self, path, timeout=60):
+        super().__init__('localhost', timeout=timeout)
+        self.unix_path = path
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(self.timeout)
+        self.sock.connect(self.unix_path)
+
+
+def default_image():
+    """Dernière image du dossier captures"""
+    images = sorted(Path("captures").glob("*.jpg"))
+    if not images:
+        raise SystemExit("Aucune image dans captures/ - utilisez --image")
+    return images[-1]
+
+
+def run_load(connect, payload, concurrency, total):
+    """Envoie `total` requêtes réparties sur `concurrency` clients"""
+    latencies = []
+    statuses = {}
+    lock = threading.Lock()
+    counter = iter(range(total))
+
+    def client():
+        conn = connect()
+        while True:
+            with lock:
+                if next(counter, None) is None:
+                    break
+            start = time.perf_counter()
+            try:
+                conn.request('POST', '/ocr', body=payload,
+                             headers={'Content-Type': 'application/octet-stream'})
+                response = conn.getresponse()
+                response.read()
+                status = response.status
+            except (OSError, http.client.HTTPException):
+                status = 'erreur'
+                conn.close()
+                conn = connect()
+            elapsed = time.perf_counter() - start
+            with lock:
+                statuses[status] = statuses.get(status, 0) + 1
+                if status == 200:
+                    latencies.append(elapsed)
+        conn.close()
+
+    threads = [threading.Thread(target=client) for _ in range(concurrency)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    duration = time.perf_counter() - start
+    return duration, latencies, statuses
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Test de charge du service OCR")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--unix', help="Chemin du socket Unix")
+    parser.add_argument('--image', type=Path, help="Image envoyée (défaut: dernière capture)")
+    parser.add_argument('--concurrency', type=int, default=4, help="Clients simultanés")
+    parser.add_argument('--requests', type=int, default=50, help="Nombre total de requêtes")
+    parser.add_argument('--json', action='store_true', help="Sortie JSON")
+    args = parser.parse_args(argv)
+
+    payload = (args.image or default_image()).read_bytes()
+    if args.unix:
+        connect = lambda: UnixHTTPConnection(args.unix)
+    else:
+        connect = lambda: http.client.HTTPConnection(args.host, args.port, timeout=60)
+
+    duration, latencies, statuses = run_load(connect, payload, args.concurrency, args.requests)
+
+    report = {
+        'requests': args.requests,
+        'concurrency': args.concurrency,
+        'duration_s': round(duration, 3),
+        'requests_per_s': round(len(latencies) / duration, 2) if duration else 0.0,
+        'statuses': {str(k): v for k, v in statuses.items()},
+        'latency_ms': {
+            name: round(percentile(latencies, pct) * 1000, 1)
+            for name, pct in (('p50', 50), ('p95', 95), ('p99', 99), ('max', 100))
+        },
+    }
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print(f"Requêtes: {args.requests} ({args.concurrency} clients) en {report['duration_s']} s")
+        print(f"Débit: {report['requests_per_s']} requêtes/s")
+        print(f"Statuts: {report['statuses']}")
+        print("Latence (ms): " + ", ".join(f"{k}={v}" for k, v in report['latency_ms'].items()))
+
+
+if __name__ == "__main__":
+    main()
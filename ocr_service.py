@@ -0,0 +1,325 @@
+"""
+Service OCR local (HTTP localhost ou socket Unix)
+Permet à d'autres applications (scanner, bornes...) de soumettre des images:
+- POST /ocr : image brute (corps de la requête) ou multipart/form-data
+  Réponse JSON: texte, mots avec boîtes englobantes et confiances
+  Option ?speak=1 : lit le texte à voix haute sur la machine du service
+- GET /health : état du service (file d'attente, requêtes en cours, latence)
+
+Les moteurs restent chauds (Tesseract vérifié au démarrage, pyttsx3 initialisé
+une seule fois) et les requêtes passent par un pool de workers borné.
+
+Usage:
+    python ocr_service.py --port 8765 --workers 2 --queue 8
+    python ocr_service.py --unix /tmp/readit-ocr.sock
+"""
+
+import argparse
+import json
+import logging
+import os
+import queue
+import socketserver
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from email.parser import BytesParser
+from email.policy import HTTP
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+import ocr_engine
+from ocr_engine import Logger
+from profiling import profiler
+
+MAX_BODY_SIZE = 20 * 1024 * 1024  # 20 Mo
+
+
+class QueueFullError(Exception):
+    """Levée quand la file d'attente du service est pleine"""
+
+
+class TTSWorker:
+    """Thread unique propriétaire du moteur pyttsx3 (non thread-safe)"""
+
+    def __init__(self):
+        self.queue = queue.Queue()
+        self.thread = threading.Thread(target=self._run, name="tts", daemon=True)
+        self.thread.start()
+
+    def _run(self):
+        try:
+            engine = ocr_engine.create_tts_engine()
+        except Exception as e:
+            Logger.error(f"TTS: Erreur d'initialisation - {e}")
+            engine = None
+        if engine is None:
+            Logger.warning("TTS: Aucun moteur disponible pour le service")
+
+        while True:
+            text = self.queue.get()
+            if text is None:
+                break
+            if engine is None:
+                continue
+            try:
+                engine.say(text)
+                engine.runAndWait()
+            except Exception as e:
+                Logger.error(f"Erreur TTS: {e}")
+
+    def speak(self, text):
+        self.queue.put(text)
+
+    def stop(self):
+        self.queue.put(None)
+
+
+class OCRService:
+    """Pool de workers OCR avec file d'attente bornée"""
+
+    def __init__(self, workers=2, max_queue=8, timeout=30.0, speak=False):
+        self.workers = workers
+        self.max_queue = max_queue
+        self.timeout = timeout
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ocr")
+        # Une place par worker plus les requêtes en attente
+        self.slots = threading.BoundedSemaphore(workers + max_queue)
+        self.tts = TTSWorker() if speak else None
+
+        self.lock = threading.Lock()
+        self.pending = 0
+        self.completed = 0
+        self.rejected = 0
+        self.failed = 0
+        self.total_latency = 0.0
+
+        ocr_engine.warm_up()
+
+    def recognize(self, data, speak=False):
+        """Traite une image (octets) et renvoie le résultat OCR
+
+        Lève QueueFullError si la file d'attente est pleine.
+        """
+        if not self.slots.acquire(blocking=False):
+            with self.lock:
+                self.rejected += 1
+            raise QueueFullError("File d'attente pleine")
+
+        with self.lock:
+            self.pending += 1
+            # Profondeur de file (en attente + en traitement) pour le profilage
+            profiler.set_gauge('ocr', self.pending)
+        start = time.perf_counter()
+        future = self.executor.submit(self._process, data)
+        # La place n'est libérée qu'à la fin réelle du traitement,
+        # même si le client a abandonné après le délai
+        future.add_done_callback(self._release_slot)
+        try:
+            result = future.result(timeout=self.timeout)
+        except Exception:
+            with self.lock:
+                self.failed += 1
+            raise
+
+        elapsed = time.perf_counter() - start
+        with self.lock:
+            self.completed += 1
+            self.total_latency += elapsed
+        result['latency_ms'] = round(elapsed * 1000, 1)
+
+        if speak and self.tts and result['text']:
+            self.tts.speak(result['text'])
+        return result
+
+    def _release_slot(self, future):
+        with self.lock:
+            self.pending -= 1
+            profiler.set_gauge('ocr', self.pending)
+        self.slots.release()
+
+    @profiler.timed('ocr')
+    def _process(self, data):
+        image = ocr_engine.decode_image(data)
+        return ocr_engine.extract_data(image)
+
+    def stats(self):
+        with self.lock:
+            return {
+                'workers': self.workers,
+                'max_queue': self.max_queue,
+                'pending': self.pending,
+                'completed': self.completed,
+                'rejected': self.rejected,
+                'failed': self.failed,
+                'mean_latency_ms': round(
+                    self.total_latency / self.completed * 1000, 1
+                ) if self.completed else 0.0,
+            }
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        if self.tts:
+            self.tts.stop()
+
+
+def read_image_payload(content_type, body):
+    """Extrait les octets de l'image d'un corps brut ou multipart"""
+    if not content_type.startswith('multipart/form-data'):
+        return body
+
+    header = f"Content-Type: {content_type}\r\n\r\n".encode('latin-1')
+    message = BytesParser(policy=HTTP).parsebytes(header + body)
+    parts = list(message.iter_parts())
+    # Priorité au champ "image", sinon premier fichier envoyé
+    for part in parts:
+        if part.get_param('name', header='content-disposition') == 'image':
+            return part.get_payload(decode=True)
+    for part in parts:
+        if part.get_filename():
+            return part.get_payload(decode=True)
+    raise ValueError("Aucune image dans la requête multipart")
+
+
+class OCRRequestHandler(BaseHTTPRequestHandler):
+    """Gestionnaire HTTP du service OCR"""
+
+    server_version = "ReadItOCR/1.0"
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        if urlparse(self.path).path == '/health':
+            self.send_json(200, self.server.service.stats())
+        else:
+            self.send_json(404, {'error': "Ressource inconnue"})
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        if url.path != '/ocr':
+            self.send_json(404, {'error': "Ressource inconnue"})
+            return
+
+        # Corps découpé (chunked) non supporté: Content-Length obligatoire
+        if 'chunked' in self.headers.get('Transfer-Encoding', '').lower():
+            self.send_json(411, {'error': "Content-Length requis (chunked non supporté)"})
+            self.close_connection = True
+            return
+
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+        except ValueError:
+            self.send_json(400, {'error': "Content-Length invalide"})
+            self.close_connection = True
+            return
+        if length <= 0:
+            self.send_json(400, {'error': "Corps de requête vide"})
+            return
+        if length > MAX_BODY_SIZE:
+            self.send_json(413, {'error': "Image trop volumineuse"})
+            self.close_connection = True
+            return
+        body = self.rfile.read(length)
+
+        speak = parse_qs(url.query).get('speak', ['0'])[0] in ('1', 'true')
+        try:
+            data = read_image_payload(self.headers.get('Content-Type', ''), body)
+            result = self.server.service.recognize(data, speak=speak)
+        except QueueFullError as e:
+            self.send_json(503, {'error': str(e)}, {'Retry-After': '1'})
+            return
+        except FutureTimeoutError:
+            self.send_json(504, {'error': "Délai de traitement dépassé"})
+            return
+        except ValueError as e:
+            self.send_json(400, {'error': str(e)})
+            return
+        except RuntimeError as e:
+            self.send_json(503, {'error': str(e)})
+            return
+        except Exception as e:
+            Logger.error(f"Erreur service OCR: {e}")
+            self.send_json(500, {'error': str(e)})
+            return
+
+        self.send_json(200, result)
+
+    def send_json(self, status, payload, headers=None):
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def address_string(self):
+        # Les connexions Unix n'ont pas d'adresse (host, port)
+        if isinstance(self.client_address, tuple):
+            return self.client_address[0]
+        return "unix"
+
+    def log_message(self, format, *args):
+        Logger.debug(f"OCR service: {self.address_string()} - {format % args}")
+
+
+class UnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Serveur HTTP sur socket Unix"""
+
+    daemon_threads = True
+
+
+def create_server(service, host='127.0.0.1', port=8765, unix_socket=None):
+    """Crée le serveur HTTP (TCP localhost ou socket Unix)"""
+    if unix_socket:
+        if os.path.exists(unix_socket):
+            os.unlink(unix_socket)
+        server = UnixHTTPServer(unix_socket, OCRRequestHandler)
+    else:
+        server = ThreadingHTTPServer((host, port), OCRRequestHandler)
+        server.daemon_threads = True
+    server.service = service
+    return server
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Service OCR local")
+    parser.add_argument('--host', default='127.0.0.1', help="Adresse d'écoute TCP")
+    parser.add_argument('--port', type=int, default=8765, help="Port TCP")
+    parser.add_argument('--unix', help="Chemin du socket Unix (remplace host/port)")
+    parser.add_argument('--workers', type=int, default=2, help="Nombre de workers OCR")
+    parser.add_argument('--queue', type=int, default=8, help="Requêtes en attente maximum")
+    parser.add_argument('--timeout', type=float, default=30.0, help="Délai max par requête (s)")
+    parser.add_argument('--speak', action='store_true', help="Active la lecture vocale (?speak=1)")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="[%(levelname)s] %(message)s")
+
+    # Configuration Windows pour Tesseract si nécessaire
+    if os.name == 'nt' and ocr_engine.TESSERACT_AVAILABLE:
+        ocr_engine.pytesseract.pytesseract.tesseract_cmd = r'C:\Program Files\Tesseract-OCR\tesseract.exe'
+
+    service = OCRService(
+        workers=args.workers, max_queue=args.queue,
+        timeout=args.timeout, speak=args.speak,
+    )
+    server = create_server(service, args.host, args.port, args.unix)
+    where = args.unix or f"http://{args.host}:{args.port}"
+    Logger.info(f"Service OCR à l'écoute sur {where}")
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.shutdown()
+        # Écriture des résultats de profilage (READIT_PROFILE=1)
+        if profiler.enabled:
+            profiler.disable()
+        if args.unix and os.path.exists(args.unix):
+            os.unlink(args.unix)
+
+
+if __name__ == "__main__":
+    main()
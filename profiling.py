@@ -0,0 +1,223 @@
+"""
+Profilage optionnel du thread principal et des workers
+- Durées par tick des callbacks (Clock Kivy, OCR, TTS) dans des files bornées
+- Compteurs (frames perdues) et jauges (travaux en cours, file du service OCR)
+- Échantillonneur de piles de tous les threads, export au format "folded"
+  compatible flamegraph.pl / speedscope / inferno
+
+Activation: variable d'environnement READIT_PROFILE=1, ou touche F12 dans l'application.
+Période d'échantillonnage: READIT_PROFILE_INTERVAL (ms, 10 par défaut).
+Sans activation, les mesures se réduisent à un test booléen.
+"""
+
+import functools
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from pathlib import Path
+
+from metrics import percentile
+
+Logger = logging.getLogger("kivy")
+
+# Budgets mémoire du profilage
+MAX_SAMPLES_PER_TIMER = 1000
+MAX_UNIQUE_STACKS = 20000
+# Période d'échantillonnage des piles (ms), réglable par READIT_PROFILE_INTERVAL
+SAMPLE_INTERVAL = float(os.environ.get('READIT_PROFILE_INTERVAL', 10)) / 1000
+
+PROFILE_DIR = "profiles"
+
+
+class StackSampler:
+    """Échantillonne périodiquement les piles de tous les threads Python"""
+
+    def __init__(self, interval=SAMPLE_INTERVAL, max_stacks=MAX_UNIQUE_STACKS):
+        self.interval = interval
+        self.max_stacks = max_stacks
+        self.stacks = {}
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+
+    def _run(self):
+        own = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            names = {t.ident: t.name for t in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+                    frame = frame.f_back
+                stack.append(names.get(ident, str(ident)).replace(' ', '_'))
+                key = ";".join(reversed(stack))
+                # Au-delà du budget, les nouvelles piles sont regroupées
+                if key not in self.stacks and len(self.stacks) >= self.max_stacks:
+                    key = stack[-1] + ";[autres]"
+                self.stacks[key] = self.stacks.get(key, 0) + 1
+            self.samples += 1
+
+    def reset(self):
+        """Oublie les piles d'une session précédente (échantillonneur arrêté)"""
+        self.stacks = {}
+        self.samples = 0
+
+    def folded(self):
+        """Piles au format folded: 'thread;f1;f2 nombre' par ligne"""
+        return "\n".join(f"{stack} {count}" for stack, count in sorted(self.stacks.items()))
+
+
+class Profiler:
+    """Mesures de durée, compteurs et jauges partagés par l'application"""
+
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.lock = threading.Lock()
+        self.timers = {}
+        self.counters = {}
+        self.gauges = {}
+        self.started = time.perf_counter()
+        self.sampler = StackSampler()
+        if enabled:
+            self.sampler.start()
+
+    def enable(self):
+        """Démarre une nouvelle session: les mesures précédentes sont oubliées"""
+        self.sampler.stop()
+        with self.lock:
+            self.timers = {}
+            self.counters = {}
+            self.started = time.perf_counter()
+        self.sampler.reset()
+        self.enabled = True
+        self.sampler.start()
+        Logger.info("Profilage activé")
+
+    def disable(self):
+        """Arrête le profilage et écrit les résultats"""
+        self.enabled = False
+        self.sampler.stop()
+        path = self.dump()
+        Logger.info(f"Profilage désactivé, résultats dans {path}")
+        return path
+
+    def record(self, name, duration):
+        """Enregistre la durée (s) d'un tick"""
+        if not self.enabled:
+            return
+        with self.lock:
+            timer = self.timers.get(name)
+            if timer is None:
+                timer = self.timers[name] = deque(maxlen=MAX_SAMPLES_PER_TIMER)
+            timer.append((time.perf_counter(), duration))
+
+    def timed(self, name):
+        """Décorateur mesurant la durée de chaque appel"""
+        def decorator(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return func(*args, **kwargs)
+                start = time.perf_counter()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    self.record(name, time.perf_counter() - start)
+            return wrapper
+        return decorator
+
+    def count(self, name, value=1):
+        if not self.enabled:
+            return
+        with self.lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def add_gauge(self, name, delta):
+        """Jauge toujours tenue à jour (travaux en cours), même hors profilage"""
+        with self.lock:
+            self.gauges[name] = self.gauges.get(name, 0) + delta
+
+    def set_gauge(self, name, value):
+        """Fixe une jauge (ex: profondeur de file d'attente)"""
+        with self.lock:
+            self.gauges[name] = value
+
+    def rate(self, name, window=1.0):
+        """Nombre d'appels par seconde sur la dernière fenêtre"""
+        since = time.perf_counter() - window
+        with self.lock:
+            timer = self.timers.get(name, ())
+            return sum(1 for t, _ in timer if t >= since) / window
+
+    def last(self, name):
+        with self.lock:
+            timer = self.timers.get(name)
+            return timer[-1][1] if timer else None
+
+    def stats(self):
+        """Statistiques par mesure (ms)"""
+        with self.lock:
+            timers = {name: [d for _, d in timer] for name, timer in self.timers.items()}
+            counters = dict(self.counters)
+            gauges = dict(self.gauges)
+        return {
+            'timers': {
+                name: {
+                    'count': len(durations),
+                    'mean_ms': round(sum(durations) / len(durations) * 1000, 2),
+                    'p95_ms': round(percentile(durations, 95) * 1000, 2),
+                    'max_ms': round(max(durations) * 1000, 2),
+                }
+                for name, durations in timers.items() if durations
+            },
+            'counters': counters,
+            'gauges': gauges,
+            'stack_samples': self.sampler.samples,
+        }
+
+    def ticks(self):
+        """Séries brutes par mesure: [instant (s depuis l'activation), durée (ms)]"""
+        with self.lock:
+            return {
+                name: [
+                    [round(t - self.started, 6), round(d * 1000, 3)] for t, d in timer
+                ]
+                for name, timer in self.timers.items()
+            }
+
+    def dump(self, directory=PROFILE_DIR):
+        """Écrit les piles (folded), les statistiques et les durées par tick (JSON)"""
+        directory = Path(directory)
+        directory.mkdir(exist_ok=True)
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+        (directory / f"stacks_{timestamp}.folded").write_text(self.sampler.folded())
+        report = self.stats()
+        report['ticks'] = self.ticks()
+        stats_path = directory / f"ticks_{timestamp}.json"
+        stats_path.write_text(json.dumps(report, indent=2))
+        return directory
+
+
+profiler = Profiler(enabled=os.environ.get('READIT_PROFILE') == '1')
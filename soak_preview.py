@@ -0,0 +1,141 @@
+"""
+Test d'endurance mémoire de la prévisualisation + capture
+Pilote le vrai widget CameraPreview (start_camera, update_camera,
+capture_current_frame) sur une source synthétique, sans lancer l'application:
+la texture réutilisée et les buffers de main.py sont donc exercés.
+Le script échoue (code 1) si la mémoire résidente (RSS) augmente de plus
+de la tolérance après la phase de chauffe, ou si une nouvelle texture est
+créée en cours de route.
+
+Kivy a besoin d'un contexte OpenGL: sur une machine sans écran, utiliser Xvfb.
+
+Usage:
+    xvfb-run python soak_preview.py --frames 20000 --capture-every 300
+    python soak_preview.py --frames 5000 --ocr   # inclut Tesseract
+    python soak_preview.py --source video:session.mp4
+"""
+
+import argparse
+import gc
+import os
+import sys
+import tempfile
+import time
+
+import ocr_engine
+
+
+def rss_bytes():
+    """Mémoire résidente actuelle du processus"""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except OSError:
+        import resource
+        usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss est en octets sur macOS, en Ko ailleurs
+        return usage if sys.platform == 'darwin' else usage * 1024
+
+
+def absolute_spec(spec):
+    """Chemins des sources de relecture rendus absolus (le script change de dossier)"""
+    kind, _, arg = spec.partition(':')
+    if kind in ('video', 'images') and arg:
+        return f"{kind}:{os.path.abspath(arg)}"
+    return spec
+
+
+def run_soak(preview, frames, capture_every, warmup, sample_every, with_ocr):
+    """Exécute la boucle et renvoie la liste des échantillons RSS (octets)"""
+    samples = []
+
+    for i in range(frames):
+        if not preview.update_camera(0):
+            raise RuntimeError("update_camera a échoué (voir le journal Kivy)")
+
+        if capture_every and i % capture_every == 0:
+            image_path, frame = preview.capture_current_frame()
+            try:
+                if frame is not None:
+                    if with_ocr:
+                        ocr_engine.extract_text(frame)
+                    else:
+                        ocr_engine.preprocess(frame)
+            finally:
+                preview.release_frame(frame)
+                if image_path:
+                    os.remove(image_path)
+
+        if i >= warmup and i % sample_every == 0:
+            gc.collect()
+            samples.append(rss_bytes())
+
+    return samples
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Test d'endurance mémoire de la prévisualisation")
+    parser.add_argument('--frames', type=int, default=20000, help="Nombre de frames")
+    parser.add_argument('--capture-every', type=int, default=300, help="Capture tous les N frames")
+    parser.add_argument('--warmup', type=int, default=1000, help="Frames ignorés avant la mesure")
+    parser.add_argument('--sample-every', type=int, default=500, help="Mesure RSS tous les N frames")
+    parser.add_argument('--tolerance-mb', type=float, default=8.0, help="Croissance RSS tolérée (Mo)")
+    # Source plus grande que l'affichage pour exercer le redimensionnement
+    parser.add_argument('--source', default='synthetic:1280x720', help="Source de frames")
+    parser.add_argument('--ocr', action='store_true', help="Exécute Tesseract à chaque capture")
+    args = parser.parse_args(argv)
+
+    # Kivy sans analyse des arguments ni journal console à chaque frame
+    os.environ.setdefault('KIVY_NO_ARGS', '1')
+    os.environ.setdefault('KIVY_NO_CONSOLELOG', '1')
+    # La boucle est pilotée par le script: source sans cadence
+    os.environ['READIT_SOURCE'] = absolute_spec(args.source)
+    os.environ['READIT_SOURCE_FPS'] = '0'
+    # Les captures sont écrites dans un dossier temporaire
+    os.chdir(tempfile.mkdtemp(prefix="readit_soak_"))
+
+    from main import CameraPreview
+
+    preview = CameraPreview()
+    preview.start_camera()
+    if not preview.camera_active:
+        print(f"Impossible d'ouvrir la source {args.source}: {preview.info_label.text}")
+        return 2
+    # update_camera est appelé directement, pas par la Clock
+    preview.capture_event.cancel()
+    texture = preview.texture
+
+    start = time.perf_counter()
+    try:
+        samples = run_soak(
+            preview, args.frames, args.capture_every,
+            args.warmup, args.sample_every, args.ocr,
+        )
+    finally:
+        duration = time.perf_counter() - start
+        nbytes = preview.frames.nbytes
+        texture_reused = preview.texture is texture and preview.camera_display.texture is texture
+        preview.stop_camera()
+
+    if len(samples) < 2:
+        print("Pas assez d'échantillons: augmentez --frames")
+        return 2
+
+    growth = (max(samples) - samples[0]) / (1024 * 1024)
+    print(f"{args.frames} frames en {duration:.1f} s ({args.frames / duration:.0f} frames/s)")
+    print(f"Buffers: {nbytes / (1024 * 1024):.1f} Mo")
+    print(f"RSS initiale: {samples[0] / (1024 * 1024):.1f} Mo, "
+          f"max: {max(samples) / (1024 * 1024):.1f} Mo, croissance: {growth:.1f} Mo")
+
+    if not texture_reused:
+        print("ÉCHEC: la texture de prévisualisation n'est pas réutilisée")
+        return 1
+    if growth > args.tolerance_mb:
+        print(f"ÉCHEC: croissance RSS supérieure à {args.tolerance_mb} Mo")
+        return 1
+    print("OK: mémoire stable")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,100 @@
+"""Tests des sources de frames (frame_sources.py)"""
+
+import time
+
+import pytest
+
+np = pytest.importorskip("numpy")
+cv2 = pytest.importorskip("cv2")
+
+from frame_sources import (
+    DEFAULT_FPS, FrameSource, ImageDirectorySource, Pacer, SyntheticSource, create_source,
+)
+
+
+def test_frame_source_is_abstract():
+    with pytest.raises(TypeError):
+        FrameSource()
+
+
+def test_synthetic_source_is_deterministic_and_scrolls():
+    a, b = SyntheticSource(320, 240), SyntheticSource(320, 240)
+    ret, first = a.read()
+    assert ret and first.shape == (240, 320, 3)
+    assert np.array_equal(first, b.read()[1])
+    assert not np.array_equal(first, a.read()[1])
+
+
+def test_synthetic_source_reuses_buffer_and_stops_after_frames():
+    source = SyntheticSource(320, 240, frames=2)
+    buffer = np.empty((240, 320, 3), dtype=np.uint8)
+    assert source.read(buffer)[1] is buffer
+    assert source.read(buffer)[1] is buffer
+    assert source.read(buffer) == (False, None)
+
+
+def write_images(directory, count, shape=(48, 64, 3)):
+    for i in range(count):
+        cv2.imwrite(str(directory / f"{i:02d}.png"), np.full(shape, i * 50, dtype=np.uint8))
+
+
+def test_image_directory_loops(tmp_path):
+    write_images(tmp_path, 2)
+    source = ImageDirectorySource(tmp_path)
+    assert source.isOpened()
+    values = [int(source.read()[1][0, 0, 0]) for _ in range(3)]
+    assert values == [0, 50, 0]
+
+
+def test_image_directory_skips_unreadable_image(tmp_path):
+    write_images(tmp_path, 1)
+    (tmp_path / "01.png").write_bytes(b"pas une image")
+    source = ImageDirectorySource(tmp_path)
+    assert source.read()[0]
+    assert source.read() == (False, None)
+    # La lecture suivante repart au début du dossier
+    assert source.read()[0]
+
+
+def test_image_directory_reuses_matching_buffer(tmp_path):
+    write_images(tmp_path, 1)
+    source = ImageDirectorySource(tmp_path)
+    buffer = np.zeros((48, 64, 3), dtype=np.uint8)
+    ret, frame = source.read(buffer)
+    assert ret and frame is buffer
+    other = np.zeros((10, 10, 3), dtype=np.uint8)
+    ret, frame = source.read(other)
+    assert ret and frame is not other and frame.shape == (48, 64, 3)
+
+
+def test_empty_image_directory_is_not_opened(tmp_path):
+    source = ImageDirectorySource(tmp_path)
+    assert not source.isOpened()
+    assert source.read() == (False, None)
+
+
+@pytest.mark.parametrize("fps", [None, 0])
+def test_pacer_without_fps_does_not_wait(fps):
+    pacer = Pacer(fps)
+    start = time.perf_counter()
+    for _ in range(1000):
+        pacer.wait()
+    assert time.perf_counter() - start < 0.1
+
+
+def test_create_source_synthetic_size(monkeypatch):
+    monkeypatch.delenv('READIT_SOURCE_FPS', raising=False)
+    source = create_source("synthetic:320x200")
+    assert isinstance(source, SyntheticSource)
+    assert source.read()[1].shape == (200, 320, 3)
+    assert source.fps == DEFAULT_FPS
+
+
+def test_create_source_fps_zero_from_environment(monkeypatch):
+    monkeypatch.setenv('READIT_SOURCE_FPS', '0')
+    assert create_source("synthetic").fps is None
+
+
+def test_create_source_unknown_kind():
+    with pytest.raises(ValueError):
+        create_source("scanner:1")
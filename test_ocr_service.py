@@ -0,0 +1,147 @@
+"""Tests du service OCR local (ocr_service.py), moteur OCR remplacé par un stub"""
+
+import http.client
+import json
+import threading
+import time
+
+import pytest
+
+pytest.importorskip("cv2")
+pytest.importorskip("numpy")
+
+import ocr_engine
+import ocr_service
+
+
+@pytest.fixture
+def engine(monkeypatch):
+    """decode_image/extract_data factices: le texte reconnu est le corps reçu"""
+    state = {'gate': None}
+
+    def extract_data(image):
+        if state['gate'] is not None:
+            state['gate'].wait(5)
+        return {'text': image.decode('utf-8'), 'words': [], 'mean_confidence': 0.0}
+
+    monkeypatch.setattr(ocr_engine, 'warm_up', lambda: True)
+    monkeypatch.setattr(ocr_engine, 'decode_image', lambda data: data)
+    monkeypatch.setattr(ocr_engine, 'extract_data', extract_data)
+    return state
+
+
+def start_server(workers=1, max_queue=2):
+    service = ocr_service.OCRService(workers=workers, max_queue=max_queue, timeout=5.0)
+    server = ocr_service.create_server(service, port=0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return service, server
+
+
+@pytest.fixture
+def server(engine):
+    service, server = start_server()
+    yield server
+    server.shutdown()
+    server.server_close()
+    service.shutdown()
+
+
+def post(server, body=b"", headers=None, path='/ocr'):
+    conn = http.client.HTTPConnection('127.0.0.1', server.server_address[1], timeout=5)
+    try:
+        conn.putrequest('POST', path)
+        for name, value in (headers or {'Content-Length': str(len(body))}).items():
+            conn.putheader(name, value)
+        conn.endheaders()
+        if body:
+            conn.send(body)
+        response = conn.getresponse()
+        return response.status, dict(response.getheaders()), json.loads(response.read())
+    finally:
+        conn.close()
+
+
+def multipart(*parts):
+    """Corps multipart/form-data: parts = (nom, nom de fichier ou None, octets)"""
+    boundary = "readit-boundary"
+    body = b""
+    for name, filename, data in parts:
+        disposition = f'form-data; name="{name}"'
+        if filename:
+            disposition += f'; filename="{filename}"'
+        body += (
+            f"--{boundary}\r\nContent-Disposition: {disposition}\r\n"
+            "Content-Type: application/octet-stream\r\n\r\n"
+        ).encode() + data + b"\r\n"
+    body += f"--{boundary}--\r\n".encode()
+    return body, f"multipart/form-data; boundary={boundary}"
+
+
+def test_raw_body_is_recognized(server):
+    status, _, result = post(server, b"Bonjour")
+    assert status == 200
+    assert result['text'] == "Bonjour"
+    assert 'latency_ms' in result
+
+
+def test_multipart_file_is_recognized(server):
+    body, content_type = multipart(("fichier", "page.jpg", b"Page scannee"))
+    status, _, result = post(server, body, {
+        'Content-Type': content_type, 'Content-Length': str(len(body)),
+    })
+    assert status == 200
+    assert result['text'] == "Page scannee"
+
+
+def test_multipart_image_field_has_priority(server):
+    body, content_type = multipart(
+        ("autre", "autre.jpg", b"Mauvaise image"),
+        ("image", "page.jpg", b"Bonne image"),
+    )
+    status, _, result = post(server, body, {
+        'Content-Type': content_type, 'Content-Length': str(len(body)),
+    })
+    assert status == 200
+    assert result['text'] == "Bonne image"
+
+
+def test_invalid_content_length_is_rejected(server):
+    status, _, result = post(server, headers={'Content-Length': 'abc'})
+    assert status == 400
+    assert 'error' in result
+
+
+def test_chunked_body_is_rejected(server):
+    status, _, _ = post(server, headers={'Transfer-Encoding': 'chunked'})
+    assert status == 411
+
+
+def test_too_large_body_is_rejected(server, monkeypatch):
+    monkeypatch.setattr(ocr_service, 'MAX_BODY_SIZE', 4)
+    status, _, _ = post(server, b"Trop grand")
+    assert status == 413
+
+
+def test_full_queue_returns_503_with_retry_after(engine):
+    engine['gate'] = threading.Event()
+    service, server = start_server(workers=1, max_queue=0)
+    try:
+        # La seule place est occupée par une requête bloquée dans l'OCR
+        first = threading.Thread(target=post, args=(server, b"Premiere"))
+        first.start()
+        for _ in range(500):
+            if service.stats()['pending']:
+                break
+            time.sleep(0.01)
+        assert service.stats()['pending'] == 1
+
+        status, headers, _ = post(server, b"Seconde")
+        assert status == 503
+        assert headers['Retry-After'] == '1'
+        assert service.stats()['rejected'] == 1
+    finally:
+        engine['gate'].set()
+        first.join(5)
+        server.shutdown()
+        server.server_close()
+        service.shutdown()
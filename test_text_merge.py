@@ -0,0 +1,90 @@
+"""Tests de la fusion incrémentale du texte (text_merge.py)"""
+
+from text_merge import TextMerger, normalize_line, same_line
+
+
+def test_first_capture_speaks_everything():
+    merger = TextMerger()
+    spoken = merger.merge("Bonjour à tous\nLigne deux\n\nLigne trois")
+    assert spoken == ["Bonjour à tous", "Ligne deux", "Ligne trois"]
+    assert merger.text == "Bonjour à tous\nLigne deux\nLigne trois"
+
+
+def test_scroll_down_speaks_only_new_lines():
+    merger = TextMerger()
+    merger.merge("Il était une fois un roi.\nIl vivait dans un château.\nLe château était grand.")
+    spoken = merger.merge("Il vivait dans un chateau\nLe château était grand.\nUn jour, la reine partit.")
+    assert spoken == ["Un jour, la reine partit."]
+    assert merger.lines == [
+        "Il était une fois un roi.",
+        "Il vivait dans un château.",
+        "Le château était grand.",
+        "Un jour, la reine partit.",
+    ]
+
+
+def test_scroll_up_inserts_lines_above():
+    merger = TextMerger()
+    merger.merge("Il vivait dans un château.\nLe château était grand.")
+    spoken = merger.merge("Chapitre premier\nIl vivait dans un château.\nLe château était grand.")
+    assert spoken == ["Chapitre premier"]
+    assert merger.lines[0] == "Chapitre premier"
+    assert len(merger.lines) == 3
+
+
+def test_unrelated_page_is_appended():
+    merger = TextMerger()
+    merger.merge("Chapitre 1\nIl était une fois un roi.")
+    spoken = merger.merge("Chapitre 2\nLa reine partit en voyage.")
+    assert spoken == ["Chapitre 2", "La reine partit en voyage."]
+    assert merger.lines == [
+        "Chapitre 1",
+        "Il était une fois un roi.",
+        "Chapitre 2",
+        "La reine partit en voyage.",
+    ]
+
+
+def test_number_change_between_known_lines_is_spoken():
+    merger = TextMerger()
+    merger.merge("Facture du mois\nTotal: 12 euros\nMerci de votre visite")
+    spoken = merger.merge("Facture du mois\nTotal: 13 euros\nMerci de votre visite")
+    assert spoken == ["Total: 13 euros"]
+    assert merger.lines == ["Facture du mois", "Total: 13 euros", "Merci de votre visite"]
+
+
+def test_numbers_are_never_the_same_line():
+    assert not same_line(normalize_line("Chapitre 1"), normalize_line("Chapitre 2"))
+    assert not same_line(normalize_line("page 12"), normalize_line("page 13"))
+    assert same_line(normalize_line("La troisième ligne"), normalize_line("la troisieme lgne"))
+
+
+def test_repeat_capture_speaks_nothing():
+    merger = TextMerger()
+    merger.merge("Ligne un\nLigne deux")
+    assert merger.merge("Ligne un.\nligne deux") == []
+    assert merger.lines == ["Ligne un", "Ligne deux"]
+
+
+def test_document_is_trimmed_to_budget():
+    merger = TextMerger(max_lines=3)
+    merger.merge("a premier\nb second\nc troisième")
+    merger.merge("c troisième\nd quatrième\ne cinquième")
+    assert merger.lines == ["c troisième", "d quatrième", "e cinquième"]
+
+
+def test_shared_header_and_footer_keep_pages_in_order():
+    merger = TextMerger()
+    merger.merge("Le Petit Prince\nIl etait une fois…\nqui habitait une planete\nAntoine de Saint-Exupery")
+    spoken = merger.merge(
+        "Le Petit Prince\nLe renard apparut alors\net demanda a etre apprivoise\nAntoine de Saint-Exupery"
+    )
+    assert spoken == ["Le renard apparut alors", "et demanda a etre apprivoise"]
+    assert merger.lines == [
+        "Le Petit Prince",
+        "Il etait une fois…",
+        "qui habitait une planete",
+        "Le renard apparut alors",
+        "et demanda a etre apprivoise",
+        "Antoine de Saint-Exupery",
+    ]
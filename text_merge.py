@@ -0,0 +1,183 @@
+"""
+Fusion incrémentale du texte de captures successives
+Quand l'utilisateur descend dans une page et capture à nouveau, les lignes
+déjà lues sont reconnues et seules les lignes nouvelles ou modifiées sont
+lues à voix haute. Les lignes de la capture sont alignées, dans l'ordre,
+sur les lignes récentes du document (difflib.SequenceMatcher sur les lignes
+normalisées, deux lignes étant "identiques" malgré le bruit OCR si leurs
+nombres sont égaux et leurs caractères assez proches).
+Le document complet est conservé, dans la limite d'un budget de lignes.
+"""
+
+import re
+import unicodedata
+from difflib import SequenceMatcher
+
+# Seuils de similarité entre lignes normalisées
+SAME_LINE_RATIO = 0.85     # au-dessus (et mêmes nombres): même ligne (bruit OCR)
+CHANGED_LINE_RATIO = 0.6   # au-dessus, entre deux lignes reconnues: ligne modifiée
+
+# Budget du document fusionné
+MAX_DOCUMENT_LINES = 1000
+# Lignes récentes comparées aux nouvelles captures
+HISTORY_WINDOW = 200
+
+_PUNCTUATION = re.compile(r"[^\w\s]")
+_SPACES = re.compile(r"\s+")
+_NUMBERS = re.compile(r"\d+")
+
+
+def normalize_line(line):
+    """Minuscules, sans accents, ponctuation ni espaces multiples"""
+    line = unicodedata.normalize('NFKD', line.lower())
+    line = "".join(c for c in line if not unicodedata.combining(c))
+    line = _PUNCTUATION.sub(" ", line)
+    return _SPACES.sub(" ", line).strip()
+
+
+def similarity(a, b):
+    """Similarité entre deux lignes normalisées (0 à 1)"""
+    if a == b:
+        return 1.0
+    matcher = SequenceMatcher(None, a, b, autojunk=False)
+    # Filtres rapides avant le calcul complet
+    if matcher.real_quick_ratio() < CHANGED_LINE_RATIO:
+        return 0.0
+    if matcher.quick_ratio() < CHANGED_LINE_RATIO:
+        return 0.0
+    return matcher.ratio()
+
+
+def same_line(a, b):
+    """Vrai si deux lignes normalisées sont la même ligne lue deux fois
+
+    Les nombres (pages, prix, dates) doivent être identiques: une ligne
+    dont seul un nombre a changé n'est jamais considérée comme déjà lue.
+    """
+    if a == b:
+        return True
+    if _NUMBERS.findall(a) != _NUMBERS.findall(b):
+        return False
+    return similarity(a, b) >= SAME_LINE_RATIO
+
+
+class TextMerger:
+    """Document fusionné au fil des captures"""
+
+    def __init__(self, max_lines=MAX_DOCUMENT_LINES, window=HISTORY_WINDOW):
+        self.max_lines = max_lines
+        self.window = window
+        self.lines = []
+        self.normalized = []
+
+    @property
+    def text(self):
+        return "\n".join(self.lines)
+
+    def reset(self):
+        """Commence un nouveau document"""
+        self.lines = []
+        self.normalized = []
+
+    def merge(self, text):
+        """Fusionne le texte d'une capture et renvoie les lignes à lire
+
+        - lignes alignées sur l'historique: déjà lues, non relues
+        - lignes avant/après la partie alignée (défilement): insérées à leur place
+        - lignes différentes entre deux lignes alignées: remplacent l'ancienne
+          ligne qui leur ressemble, sinon sont insérées après les anciennes
+        - aucune ligne alignée (autre page): ajoutées à la fin du document
+        """
+        incoming = []
+        for line in text.splitlines():
+            line = line.strip()
+            norm = normalize_line(line)
+            if norm:
+                incoming.append((line, norm))
+        if not incoming:
+            return []
+
+        start = max(0, len(self.lines) - self.window)
+        history = list(zip(self.lines[start:], self.normalized[start:]))
+        keys = [self._history_key(norm, history) for _, norm in incoming]
+
+        matcher = SequenceMatcher(None, [norm for _, norm in history], keys, autojunk=False)
+        opcodes = matcher.get_opcodes()
+        equal = [i for i, op in enumerate(opcodes) if op[0] == 'equal']
+
+        if not equal:
+            # Aucune ligne reconnue: nouvelle page, ajoutée à la fin
+            merged = history + incoming
+            to_speak = [line for line, _ in incoming]
+        else:
+            merged, to_speak = self._apply(opcodes, equal[0], equal[-1], history, incoming)
+
+        self.lines[start:] = [line for line, _ in merged]
+        self.normalized[start:] = [norm for _, norm in merged]
+        self._trim()
+        return to_speak
+
+    def _history_key(self, norm, history):
+        """Clé d'alignement: la ligne d'historique identique, sinon la ligne elle-même"""
+        best, best_ratio = norm, 0.0
+        for _, known in history:
+            if known == norm:
+                return known
+            if same_line(norm, known):
+                ratio = similarity(norm, known)
+                if ratio > best_ratio:
+                    best, best_ratio = known, ratio
+        return best
+
+    def _apply(self, opcodes, first_equal, last_equal, history, incoming):
+        """Construit la fenêtre fusionnée à partir des blocs alignés"""
+        merged = []
+        to_speak = []
+
+        def add_new(lines):
+            merged.extend(lines)
+            to_speak.extend(line for line, _ in lines)
+
+        for index, (tag, i1, i2, j1, j2) in enumerate(opcodes):
+            old = history[i1:i2]
+            new = incoming[j1:j2]
+
+            if tag in ('equal', 'delete'):
+                # Lignes déjà lues (ou absentes de cette capture): conservées
+                merged.extend(old)
+            elif tag == 'insert':
+                add_new(new)
+            elif index < first_equal:
+                # Au-dessus de la partie reconnue (remontée dans la page)
+                add_new(new)
+                merged.extend(old)
+            elif index > last_equal:
+                # Après la partie reconnue (descente dans la page)
+                merged.extend(old)
+                add_new(new)
+            else:
+                # Entre deux lignes reconnues: chaque ancienne ligne n'est
+                # remplacée que par une nouvelle ligne qui lui ressemble;
+                # les autres nouvelles lignes suivent, en un seul bloc
+                unmatched = list(new)
+                for old_line in old:
+                    best, best_ratio = None, CHANGED_LINE_RATIO
+                    for new_line in unmatched:
+                        ratio = similarity(new_line[1], old_line[1])
+                        if ratio >= best_ratio:
+                            best, best_ratio = new_line, ratio
+                    if best is None:
+                        merged.append(old_line)
+                    else:
+                        unmatched.remove(best)
+                        add_new([best])
+                add_new(unmatched)
+
+        return merged, to_speak
+
+    def _trim(self):
+        """Applique le budget en retirant les lignes les plus anciennes"""
+        excess = len(self.lines) - self.max_lines
+        if excess > 0:
+            del self.lines[:excess]
+            del self.normalized[:excess]